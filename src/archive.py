@@ -0,0 +1,161 @@
+import gzip
+import json
+import logging
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+INDEX_FILE = "index.jsonl"
+SEGMENT_PATTERN = re.compile(r"^segment-(\d{5})\.gz$")
+DEFAULT_SEGMENT_BYTES = 256 * 1024 * 1024
+
+_MAGIC = b"GHPS-ARCHIVE/1.0"
+
+def _segment_name(number: int) -> str:
+    return f"segment-{number:05d}.gz"
+
+def _encode_record(url: str, html: str, fetched_at: str) -> bytes:
+    body = html.encode("utf-8")
+    header = (
+        f"URL: {url}\r\n"
+        f"Fetched-At: {fetched_at}\r\n"
+        f"Content-Length: {len(body)}\r\n"
+    ).encode("utf-8")
+    return _MAGIC + b"\r\n" + header + b"\r\n" + body
+
+def _decode_record(data: bytes) -> Tuple[str, str]:
+    head, _, body = data.partition(b"\r\n\r\n")
+    lines = head.decode("utf-8").split("\r\n")
+    if not lines or lines[0].encode("utf-8") != _MAGIC:
+        raise ValueError("Not a page archive record")
+    headers = dict(line.split(": ", 1) for line in lines[1:])
+    return headers["URL"], body.decode("utf-8")
+
+class PageArchive:
+    """
+    Append-only archive of raw profile HTML.
+
+    Pages are stored WARC-style in size-capped segment files where every
+    record is its own gzip member, so a record can be decompressed on its own
+    from its byte offset. `index.jsonl` maps each URL to its segment, offset
+    and length; when a URL is fetched again the later index entry wins.
+    Reopening a directory starts a new segment and never rewrites old ones.
+    """
+
+    def __init__(self, directory: str, segment_max_bytes: int = DEFAULT_SEGMENT_BYTES) -> None:
+        self.directory = directory
+        self.segment_max_bytes = segment_max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+        existing = [int(m.group(1)) for m in map(SEGMENT_PATTERN.match, os.listdir(directory)) if m]
+        self._segment_number = max(existing) + 1 if existing else 0
+        # Opened on first append so runs that fetch nothing leave no empty segment behind.
+        self._segment: Optional[BinaryIO] = None
+        self._index = open(os.path.join(directory, INDEX_FILE), "a", encoding="utf-8")
+        self._lock = threading.Lock()
+        self.records_written = 0
+
+    def append(self, url: str, html: str, requested_url: Optional[str] = None) -> None:
+        """
+        Archive one page under its resolved `url`. `requested_url` is the
+        input it was fetched for ('/alice', 'alice', ...) and is kept in the
+        index entry when it differs.
+        """
+        fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        member = gzip.compress(_encode_record(url, html, fetched_at), compresslevel=6)
+        with self._lock:
+            if self._segment is None:
+                self._segment = self._open_segment()
+            elif self._segment.tell() and self._segment.tell() + len(member) > self.segment_max_bytes:
+                self._segment.close()
+                self._segment_number += 1
+                self._segment = self._open_segment()
+            offset = self._segment.tell()
+            self._segment.write(member)
+            self._segment.flush()
+            entry = {
+                "url": url,
+                "segment": _segment_name(self._segment_number),
+                "offset": offset,
+                "length": len(member),
+                "fetched_at": fetched_at,
+            }
+            if requested_url is not None and requested_url != url:
+                entry["requested_url"] = requested_url
+            # The index line is written only after its record, so a crash never leaves a dangling entry.
+            self._index.write(json.dumps(entry) + "\n")
+            self._index.flush()
+            self.records_written += 1
+
+    def _open_segment(self) -> BinaryIO:
+        return open(os.path.join(self.directory, _segment_name(self._segment_number)), "ab")
+
+    def close(self) -> None:
+        with self._lock:
+            if self._segment is not None:
+                self._segment.close()
+            self._index.close()
+        logger.info("Archived %d pages to %s", self.records_written, self.directory)
+
+    def __enter__(self) -> "PageArchive":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+def iter_index(directory: str) -> Iterator[Dict[str, Any]]:
+    """
+    Yield index entries in the order the pages were archived.
+    """
+    path = os.path.join(directory, INDEX_FILE)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Archive index not found: {path}")
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+def latest_entries(directory: str) -> Dict[str, List[Tuple[int, int, str]]]:
+    """
+    Resolve the newest archived copy of every URL, grouped by segment as
+    (offset, length, url) tuples sorted by offset for sequential reads.
+    """
+    latest: Dict[str, Tuple[str, int, int]] = {}
+    for entry in iter_index(directory):
+        latest[entry["url"]] = (entry["segment"], entry["offset"], entry["length"])
+
+    by_segment: Dict[str, List[Tuple[int, int, str]]] = {}
+    for url, (segment, offset, length) in latest.items():
+        by_segment.setdefault(segment, []).append((offset, length, url))
+    for entries in by_segment.values():
+        entries.sort()
+    return by_segment
+
+def read_pages(directory: str, segment: str, entries: List[Tuple[int, int, str]]) -> Iterator[Tuple[str, str]]:
+    """
+    Yield (url, html) for the given (offset, length, url) entries of one segment.
+    """
+    with open(os.path.join(directory, segment), "rb") as f:
+        for offset, length, url in entries:
+            f.seek(offset)
+            archived_url, html = _decode_record(gzip.decompress(f.read(length)))
+            if archived_url != url:
+                raise ValueError(f"Archive index mismatch at {segment}:{offset}: {archived_url} != {url}")
+            yield url, html
+
+def read_page(directory: str, url: str) -> Optional[str]:
+    """
+    Return the newest archived HTML for a URL, or None if it was never archived.
+    """
+    found = None
+    for entry in iter_index(directory):
+        if entry["url"] == url:
+            found = entry
+    if found is None:
+        return None
+    [(_, html)] = read_pages(directory, found["segment"], [(found["offset"], found["length"], url)])
+    return html
@@ -0,0 +1,230 @@
+import argparse
+import heapq
+import json
+import logging
+import os
+import shutil
+import tempfile
+import time
+from itertools import groupby
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from outputs.compression import COMPRESSIONS
+from outputs.json_exporter import export_to_json
+from outputs.json_reader import iter_json_records
+from parsers.counts import counts_equal
+
+logger = logging.getLogger(__name__)
+
+# Fields compared by `diff` when a profile exists in both outputs.
+DIFF_FIELDS = ["followers", "location", "organization"]
+# Count fields are compared numerically, so "1.2k" from a page and "1200" from the API match.
+COUNT_FIELDS = {"followers", "following"}
+
+DEFAULT_CHUNK_RECORDS = 100_000
+
+def record_key(record: Dict[str, Any]) -> str:
+    """
+    Key profiles by lower-cased username, falling back to the login in the profile URL.
+    """
+    username = record.get("username") or ""
+    if not username:
+        username = (record.get("user") or "").rstrip("/").rsplit("/", 1)[-1]
+    return username.lower()
+
+def _read_run(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            yield json.loads(line)
+
+def external_sort(
+    records: Iterable[Dict[str, Any]],
+    chunk_records: int = DEFAULT_CHUNK_RECORDS,
+    tmp_dir: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield records sorted by record_key, holding at most `chunk_records` in memory.
+
+    Each full chunk is sorted and spilled to a temporary JSON-lines run; the
+    runs are then k-way merged. The sort is stable, so records sharing a key
+    keep their input order.
+    """
+    workdir = tempfile.mkdtemp(prefix="ghps-sort-", dir=tmp_dir)
+    runs: List[str] = []
+    try:
+        chunk: List[Dict[str, Any]] = []
+        for record in records:
+            chunk.append(record)
+            if len(chunk) >= chunk_records:
+                runs.append(_spill(chunk, workdir, len(runs)))
+                chunk = []
+        chunk.sort(key=record_key)
+
+        if not runs:
+            yield from chunk
+            return
+
+        if chunk:
+            runs.append(_spill(chunk, workdir, len(runs)))
+            chunk = []
+        logger.debug("Merging %d sorted runs from %s", len(runs), workdir)
+        yield from heapq.merge(*[_read_run(path) for path in runs], key=record_key)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def _spill(chunk: List[Dict[str, Any]], workdir: str, index: int) -> str:
+    chunk.sort(key=record_key)
+    path = os.path.join(workdir, f"run-{index:05d}.jsonl")
+    with open(path, "w", encoding="utf-8") as f:
+        for record in chunk:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+    return path
+
+def _latest_by_key(sorted_records: Iterable[Tuple[str, Dict[str, Any]]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    for key, group in groupby(sorted_records, key=lambda item: item[0]):
+        latest = None
+        for _, record in group:
+            latest = record
+        yield key, latest
+
+def _keyed(path: str, chunk_records: int, tmp_dir: Optional[str], source: int = 0) -> Iterator[Tuple[str, int, Dict[str, Any]]]:
+    for record in external_sort(iter_json_records(path), chunk_records, tmp_dir):
+        yield record_key(record), source, record
+
+def merge_outputs(
+    paths: List[str],
+    output: str,
+    chunk_records: int = DEFAULT_CHUNK_RECORDS,
+    tmp_dir: Optional[str] = None,
+    compress: Optional[str] = None,
+) -> int:
+    """
+    Merge run outputs, oldest first, into one dataset where the latest record per username wins.
+    Returns the number of records written.
+    """
+    streams = [_keyed(path, chunk_records, tmp_dir, source=i) for i, path in enumerate(paths)]
+    # Ties on the key are ordered by input position, so the newest file's record comes last.
+    merged = heapq.merge(*streams, key=lambda item: (item[0], item[1]))
+    latest = _latest_by_key((key, record) for key, _, record in merged)
+    return export_to_json((record for _, record in latest), output, compress=compress, pretty=False)
+
+def _field_changes(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    changes = {}
+    for field in DIFF_FIELDS:
+        if field in COUNT_FIELDS:
+            same = counts_equal(old.get(field), new.get(field))
+        else:
+            same = old.get(field) == new.get(field)
+        if not same:
+            changes[field] = {"old": old.get(field), "new": new.get(field)}
+    return changes
+
+def _diff_entries(
+    old_stream: Iterator[Tuple[str, Dict[str, Any]]],
+    new_stream: Iterator[Tuple[str, Dict[str, Any]]],
+    summary: Dict[str, int],
+) -> Iterator[Dict[str, Any]]:
+    done = (None, None)
+    old_key, old = next(old_stream, done)
+    new_key, new = next(new_stream, done)
+    while old_key is not None or new_key is not None:
+        if new_key is None or (old_key is not None and old_key < new_key):
+            summary["removed"] += 1
+            yield {"username": old.get("username") or old_key, "status": "removed", "user": old.get("user")}
+            old_key, old = next(old_stream, done)
+        elif old_key is None or new_key < old_key:
+            summary["new"] += 1
+            yield {"username": new.get("username") or new_key, "status": "new", "user": new.get("user")}
+            new_key, new = next(new_stream, done)
+        else:
+            changes = _field_changes(old, new)
+            if changes:
+                summary["changed"] += 1
+                yield {
+                    "username": new.get("username") or new_key,
+                    "status": "changed",
+                    "user": new.get("user"),
+                    "changes": changes,
+                }
+            else:
+                summary["unchanged"] += 1
+            old_key, old = next(old_stream, done)
+            new_key, new = next(new_stream, done)
+
+def diff_outputs(
+    old_path: str,
+    new_path: str,
+    report: str,
+    chunk_records: int = DEFAULT_CHUNK_RECORDS,
+    tmp_dir: Optional[str] = None,
+    compress: Optional[str] = None,
+) -> Dict[str, int]:
+    """
+    Write a change report of new, removed and changed profiles between two run outputs.
+    Returns counts per status.
+    """
+    old_stream = _latest_by_key((key, record) for key, _, record in _keyed(old_path, chunk_records, tmp_dir))
+    new_stream = _latest_by_key((key, record) for key, _, record in _keyed(new_path, chunk_records, tmp_dir))
+    summary = {"new": 0, "removed": 0, "changed": 0, "unchanged": 0}
+    export_to_json(_diff_entries(old_stream, new_stream, summary), report, compress=compress, pretty=False)
+    return summary
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="Merge or diff GitHub Profile Scraper outputs with bounded memory.",
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    merge_parser = subparsers.add_parser("merge", help="Merge outputs; the latest record per username wins.")
+    merge_parser.add_argument("inputs", nargs="+", help="Output files to merge, oldest first.")
+    merge_parser.add_argument("--output", required=True, help="Merged output path.")
+
+    diff_parser = subparsers.add_parser("diff", help="Report new, removed and changed profiles.")
+    diff_parser.add_argument("old", help="Older output file.")
+    diff_parser.add_argument("new", help="Newer output file.")
+    diff_parser.add_argument("--output", required=True, help="Change report path.")
+
+    for sub in (merge_parser, diff_parser):
+        sub.add_argument(
+            "--chunk-size",
+            type=int,
+            default=DEFAULT_CHUNK_RECORDS,
+            help=f"Records held in memory before spilling a sorted run to disk (default: {DEFAULT_CHUNK_RECORDS}).",
+        )
+        sub.add_argument("--tmp-dir", default=None, help="Directory for spilled sort runs (default: system temp).")
+        sub.add_argument(
+            "--compress",
+            choices=COMPRESSIONS,
+            default=None,
+            help="Compress output: none, gzip or zstd (default: inferred from a .gz/.zst output extension).",
+        )
+        sub.add_argument(
+            "--log-level",
+            default="INFO",
+            choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+            help="Logging level (default: INFO).",
+        )
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper(), logging.INFO),
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    )
+    if args.chunk_size < 1:
+        raise SystemExit("--chunk-size must be at least 1")
+
+    started = time.perf_counter()
+    if args.command == "merge":
+        written = merge_outputs(args.inputs, args.output, args.chunk_size, args.tmp_dir, args.compress)
+        logger.info("Merged %d files into %d profiles at %s", len(args.inputs), written, args.output)
+    else:
+        summary = diff_outputs(args.old, args.new, args.output, args.chunk_size, args.tmp_dir, args.compress)
+        logger.info(
+            "Diff: %d new, %d removed, %d changed, %d unchanged; report at %s",
+            summary["new"], summary["removed"], summary["changed"], summary["unchanged"], args.output,
+        )
+    logger.info("Finished %s in %.1fs", args.command, time.perf_counter() - started)
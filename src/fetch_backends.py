@@ -0,0 +1,135 @@
+import logging
+import os
+from typing import Any, Dict, List, Optional, Protocol, Tuple, Union
+from urllib.parse import urlparse
+
+from github_client import GithubClient, RequestBudgetExceeded
+from parsers.graphql_parser import USER_FIELDS, parse_graphql_user
+from parsers.profile_parser import parse_profile_html
+
+logger = logging.getLogger(__name__)
+
+# (profile URL, parsed record or the exception that prevented it)
+ProfileResult = Tuple[str, Union[Dict[str, Any], Exception]]
+
+class FetchBackend(Protocol):
+    """
+    Anything that turns a batch of profile URLs into records.
+    """
+
+    batch_size: int
+
+    def fetch_batch(self, urls: List[str]) -> List[ProfileResult]:
+        ...
+
+class HtmlBackend:
+    """
+    Default backend: fetch each profile page and parse it with BeautifulSoup.
+    """
+
+    def __init__(self, client: GithubClient) -> None:
+        self.client = client
+        self.batch_size = 1
+
+    def fetch_profile(self, url: str) -> Dict[str, Any]:
+        html = self.client.fetch_profile_html(url)
+        return parse_profile_html(html, url)
+
+    def fetch_batch(self, urls: List[str]) -> List[ProfileResult]:
+        results: List[ProfileResult] = []
+        for url in urls:
+            try:
+                results.append((url, self.fetch_profile(url)))
+            except RequestBudgetExceeded:
+                raise
+            except Exception as e:
+                results.append((url, e))
+        return results
+
+class GraphqlBackend:
+    """
+    Resolve logins in batches through GitHub's GraphQL API.
+
+    Each batch is a single query with one aliased `user(login:)` field per
+    profile. Fields the API does not expose (see HTML_ONLY_FIELDS) are filled
+    in from the HTML page only when listed in `html_fallback_fields`, which is
+    empty by default so a batch costs a single request. If the GraphQL request
+    itself fails, the whole batch is scraped through HTML instead.
+    """
+
+    def __init__(self, client: GithubClient, settings: Optional[Dict[str, Any]] = None) -> None:
+        settings = settings or {}
+        self.client = client
+        self.html = HtmlBackend(client)
+        self.endpoint = settings.get("graphql_url", "https://api.github.com/graphql")
+        self.batch_size = max(1, int(settings.get("graphql_batch_size", 50)))
+        self.html_fallback_fields: List[str] = list(settings.get("html_fallback_fields", []))
+        token = settings.get("github_token") or os.environ.get("GITHUB_TOKEN", "")
+        if not token:
+            # GitHub's GraphQL API rejects every anonymous request.
+            raise ValueError(
+                "fetch_backend 'graphql' requires github_token in settings or the GITHUB_TOKEN environment variable"
+            )
+        self.headers = {"Authorization": f"bearer {token}"}
+
+    @staticmethod
+    def login_from_url(url: str) -> str:
+        path = urlparse(url).path if "://" in url else url
+        return path.strip("/").split("/")[0]
+
+    @staticmethod
+    def build_query(logins: List[str]) -> Dict[str, Any]:
+        params = ", ".join(f"$l{i}: String!" for i in range(len(logins)))
+        aliases = "\n".join(f"  u{i}: user(login: $l{i}) {{ ...ProfileFields }}" for i in range(len(logins)))
+        query = f"query({params}) {{\n{aliases}\n}}\n\nfragment ProfileFields on User {{{USER_FIELDS}}}\n"
+        return {"query": query, "variables": {f"l{i}": login for i, login in enumerate(logins)}}
+
+    def _fill_from_html(self, url: str, profile: Dict[str, Any]) -> None:
+        try:
+            html_profile = self.html.fetch_profile(url)
+        except RequestBudgetExceeded:
+            raise
+        except Exception as e:
+            logger.warning("HTML fallback failed for %s, keeping API fields only: %s", url, e)
+            return
+        for field in self.html_fallback_fields:
+            profile[field] = html_profile.get(field, profile.get(field))
+
+    def fetch_batch(self, urls: List[str]) -> List[ProfileResult]:
+        logins = [self.login_from_url(url) for url in urls]
+        try:
+            body = self.client.post_json(self.endpoint, self.build_query(logins), headers=self.headers)
+        except RequestBudgetExceeded:
+            raise
+        except Exception as e:
+            logger.warning("GraphQL batch of %d failed, falling back to HTML: %s", len(urls), e)
+            return self.html.fetch_batch(urls)
+
+        data = body.get("data") or {}
+        if not data and body.get("errors"):
+            logger.warning("GraphQL batch returned errors, falling back to HTML: %s", body["errors"])
+            return self.html.fetch_batch(urls)
+
+        results: List[ProfileResult] = []
+        for i, url in enumerate(urls):
+            user = data.get(f"u{i}")
+            if not user:
+                results.append((url, LookupError(f"GitHub user not found via GraphQL: {logins[i]}")))
+                continue
+            profile = parse_graphql_user(user, url)
+            if self.html_fallback_fields:
+                self._fill_from_html(url, profile)
+            results.append((url, profile))
+        return results
+
+def create_backend(client: GithubClient, settings: Optional[Dict[str, Any]] = None) -> FetchBackend:
+    """
+    Build the fetch backend named by the `fetch_backend` setting ("html" or "graphql").
+    """
+    settings = settings or {}
+    name = settings.get("fetch_backend", "html")
+    if name == "html":
+        return HtmlBackend(client)
+    if name == "graphql":
+        return GraphqlBackend(client, settings)
+    raise ValueError(f"Unknown fetch_backend: {name}")
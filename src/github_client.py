@@ -5,16 +5,25 @@ from urllib.parse import urljoin, urlencode, urlparse, parse_qsl
 
 import requests
 
+from archive import PageArchive
+
 logger = logging.getLogger(__name__)
 
+class RequestBudgetExceeded(Exception):
+    """
+    Raised instead of sending a request once `request_limit` requests have been issued.
+    """
+
 class GithubClient:
     """
     Lightweight HTML client for GitHub profile and stargazers pages.
     Uses requests with sensible defaults and simple retry logic.
     """
 
-    def __init__(self, settings: Optional[Dict[str, Any]] = None) -> None:
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, archive: Optional[PageArchive] = None) -> None:
         settings = settings or {}
+        # When set, every fetched profile page is also stored for offline re-parsing.
+        self.archive = archive
         self.base_url = "https://github.com"
         self.user_agent = settings.get(
             "user_agent",
@@ -23,16 +32,25 @@ class GithubClient:
         self.timeout = settings.get("request_timeout", 15)
         self.max_retries = settings.get("max_retries", 3)
         self.sleep_between_requests = float(settings.get("sleep_between_requests", 1.0))
+        # Total HTTP requests issued, including retries; used for request budgets.
+        self.request_count = 0
+        # Hard cap on request_count, checked before every attempt (None = unlimited).
+        self.request_limit: Optional[int] = None
 
         self.session = requests.Session()
         self.session.headers.update({"User-Agent": self.user_agent})
 
-    def _request(self, url: str) -> str:
+    def _send(self, method: str, url: str, **kwargs: Any) -> requests.Response:
         last_exc: Optional[Exception] = None
         for attempt in range(1, self.max_retries + 1):
             try:
-                logger.debug("Requesting %s (attempt %d)", url, attempt)
-                resp = self.session.get(url, timeout=self.timeout)
+                logger.debug("Requesting %s %s (attempt %d)", method, url, attempt)
+                if self.request_limit is not None and self.request_count >= self.request_limit:
+                    raise RequestBudgetExceeded(
+                        f"Request budget of {self.request_limit} spent before {method} {url}"
+                    )
+                self.request_count += 1
+                resp = self.session.request(method, url, timeout=self.timeout, **kwargs)
                 if resp.status_code == 429:
                     # Rate limited, back off more aggressively
                     wait_for = self.sleep_between_requests * 2 * attempt
@@ -40,8 +58,14 @@ class GithubClient:
                     time.sleep(wait_for)
                     continue
                 resp.raise_for_status()
-                return resp.text
+                return resp
+            except RequestBudgetExceeded:
+                raise
             except Exception as e:
+                if isinstance(e, requests.HTTPError) and e.response is not None and 400 <= e.response.status_code < 500:
+                    # Client errors (bad token, missing profile) won't succeed on retry
+                    logger.error("Request to %s failed: %s", url, e)
+                    raise
                 last_exc = e
                 logger.warning("Request to %s failed (attempt %d/%d): %s", url, attempt, self.max_retries, e)
                 time.sleep(self.sleep_between_requests * attempt)
@@ -50,6 +74,15 @@ class GithubClient:
         logger.error("All retries failed for %s", url)
         raise last_exc
 
+    def _request(self, url: str) -> str:
+        return self._send("GET", url).text
+
+    def post_json(self, url: str, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> Any:
+        """
+        POST a JSON payload with the same retry logic as page fetches and return the decoded body.
+        """
+        return self._send("POST", url, json=payload, headers=headers).json()
+
     def fetch_profile_html(self, profile_url: str) -> str:
         """
         Fetch raw HTML for a GitHub profile.
@@ -61,7 +94,10 @@ class GithubClient:
             url = urljoin(self.base_url, profile_url.lstrip("/"))
 
         logger.debug("Fetching profile HTML from %s", url)
-        return self._request(url)
+        html = self._request(url)
+        if self.archive is not None:
+            self.archive.append(url, html, requested_url=profile_url)
+        return html
 
     def _normalize_stargazers_url(self, url: str) -> str:
         """
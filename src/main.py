@@ -3,21 +3,34 @@ import json
 import logging
 import os
 import sys
-from typing import List, Dict, Any, Optional
+import time
+from typing import Any, Callable, Dict, List, Optional
 
 # Make local imports work when running as `python src/main.py`
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 if CURRENT_DIR not in sys.path:
     sys.path.insert(0, CURRENT_DIR)
 
-from github_client import GithubClient
-from parsers.profile_parser import parse_profile_html
-from parsers.stargazers_parser import extract_stargazer_profiles
+import compare
+import reparse
+from archive import PageArchive
+from github_client import GithubClient, RequestBudgetExceeded
+from fetch_backends import create_backend
+from scheduler import PRIORITIES, WorkScheduler, load_follower_cache, parse_duration
+from scraper import FetchBackend, iter_profiles, iter_stargazer_urls
 from outputs.json_exporter import export_to_json
 from outputs.csv_exporter import export_to_csv
+from outputs.compression import COMPRESSIONS
 
 logger = logging.getLogger(__name__)
 
+# Offline subcommands that work on existing outputs instead of scraping.
+SUBCOMMANDS = {
+    "merge": compare.main,
+    "diff": compare.main,
+    "reparse": reparse.main,
+}
+
 def load_profiles_from_file(path: str) -> List[str]:
     if not os.path.exists(path):
         raise FileNotFoundError(f"Profiles file not found: {path}")
@@ -33,16 +46,21 @@ def load_profiles_from_file(path: str) -> List[str]:
     logger.info("Loaded %d profile URLs from %s", len(profiles), path)
     return profiles
 
-def get_profiles_from_stargazers(client: GithubClient, url: str, max_profiles: Optional[int]) -> List[str]:
-    logger.info("Discovering profiles from stargazers URL: %s", url)
+def get_profiles_from_stargazers(
+    client: GithubClient,
+    url: str,
+    max_profiles: Optional[int],
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> List[str]:
     profiles: List[str] = []
-    for page_html in client.fetch_stargazers_pages(url):
-        page_profiles = extract_stargazer_profiles(page_html)
-        for p in page_profiles:
+    try:
+        for p in iter_stargazer_urls(client, url, should_stop=should_stop):
             profiles.append(p)
             if max_profiles is not None and len(profiles) >= max_profiles:
                 logger.info("Reached max_profiles limit: %d", max_profiles)
                 return profiles
+    except RequestBudgetExceeded as e:
+        logger.warning("Stopped stargazers discovery: %s", e)
     logger.info("Discovered %d profile URLs from stargazers", len(profiles))
     return profiles
 
@@ -50,26 +68,22 @@ def scrape_profiles(
     client: GithubClient,
     profile_urls: List[str],
     max_profiles: Optional[int] = None,
+    backend: Optional[FetchBackend] = None,
 ) -> List[Dict[str, Any]]:
-    results: List[Dict[str, Any]] = []
-    for idx, url in enumerate(profile_urls, start=1):
-        if max_profiles is not None and len(results) >= max_profiles:
-            logger.info("Reached max_profiles limit: %d", max_profiles)
-            break
-
-        try:
-            logger.info("(%d/%d) Fetching profile: %s", idx, len(profile_urls), url)
-            html = client.fetch_profile_html(url)
-            profile = parse_profile_html(html, url)
-            results.append(profile)
-        except Exception as e:
-            logger.exception("Failed to scrape profile %s: %s", url, e)
+    results = list(iter_profiles(profile_urls, client=client, max_profiles=max_profiles, backend=backend))
     logger.info("Successfully scraped %d profiles", len(results))
     return results
 
 def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
-        description="GitHub Profile Scraper - scrape profile metadata and contribution signals."
+        description="GitHub Profile Scraper - scrape profile metadata and contribution signals.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=(
+            "subcommands (run 'main.py <subcommand> --help' for options):\n"
+            "  merge    merge run outputs, keeping the latest record per username\n"
+            "  diff     report new, removed and changed profiles between two outputs\n"
+            "  reparse  rebuild output from a page archive without network access"
+        ),
     )
 
     input_group = parser.add_mutually_exclusive_group(required=True)
@@ -93,12 +107,51 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         default="json",
         help="Output format: json or csv (default: json).",
     )
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSIONS,
+        default=None,
+        help="Compress output: none, gzip or zstd (default: inferred from a .gz/.zst output extension).",
+    )
     parser.add_argument(
         "--max-profiles",
         type=int,
         default=None,
         help="Maximum number of profiles to process (default: no limit).",
     )
+    parser.add_argument(
+        "--deadline",
+        type=parse_duration,
+        default=None,
+        help="Stop cleanly before this much wall-clock time has passed, e.g. 900, 30m or 2h (default: none).",
+    )
+    parser.add_argument(
+        "--request-budget",
+        type=int,
+        default=None,
+        help="Stop cleanly before issuing more than this many HTTP requests (default: no limit).",
+    )
+    parser.add_argument(
+        "--priority",
+        choices=PRIORITIES,
+        default="input",
+        help="Processing order: input file order, or highest cached follower count first (default: input).",
+    )
+    parser.add_argument(
+        "--priority-cache",
+        default=None,
+        help="Previous JSON output to read follower counts from when --priority=followers.",
+    )
+    parser.add_argument(
+        "--unprocessed-output",
+        default=None,
+        help="Where to write URLs left unprocessed by a stopped run (default: <output>.unprocessed.txt).",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        default=None,
+        help="Also store raw profile HTML in this page archive for offline re-parsing (default: settings archive_dir, else off).",
+    )
     parser.add_argument(
         "--config",
         default=os.path.join(CURRENT_DIR, "config", "settings.example.json"),
@@ -110,7 +163,10 @@ def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
         choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
         help="Logging level (default: INFO).",
     )
-    return parser.parse_args(argv)
+    args = parser.parse_args(argv)
+    if args.priority == "followers" and not args.priority_cache:
+        parser.error("--priority followers requires --priority-cache")
+    return args
 
 def load_settings(path: str) -> Dict[str, Any]:
     if not os.path.exists(path):
@@ -124,6 +180,13 @@ def load_settings(path: str) -> Dict[str, Any]:
         return {}
 
 def main(argv: Optional[List[str]] = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in SUBCOMMANDS:
+        SUBCOMMANDS[argv[0]](argv)
+        return
+
+    # The --deadline clock starts here, so stargazers discovery counts against it.
+    started = time.monotonic()
     args = parse_args(argv)
     logging.basicConfig(
         level=getattr(logging, args.log_level.upper(), logging.INFO),
@@ -131,27 +194,68 @@ def main(argv: Optional[List[str]] = None) -> None:
     )
 
     settings = load_settings(args.config)
-    client = GithubClient(settings=settings)
+    archive_dir = args.archive_dir or settings.get("archive_dir")
+    archive = PageArchive(archive_dir) if archive_dir else None
+    try:
+        _run_scrape(args, settings, archive, started)
+    finally:
+        if archive is not None:
+            archive.close()
+
+def _run_scrape(
+    args: argparse.Namespace,
+    settings: Dict[str, Any],
+    archive: Optional[PageArchive],
+    started: float,
+) -> None:
+    client = GithubClient(settings=settings, archive=archive)
+    backend = create_backend(client, settings)
+    follower_cache = load_follower_cache(args.priority_cache) if args.priority == "followers" else None
+    scheduler = WorkScheduler(
+        client,
+        backend,
+        deadline=args.deadline,
+        request_budget=args.request_budget,
+        priority=args.priority,
+        follower_cache=follower_cache,
+        started_at=started,
+    )
 
     # Build list of profile URLs
     if args.profiles_file:
         profile_urls = load_profiles_from_file(args.profiles_file)
     else:
-        profile_urls = get_profiles_from_stargazers(client, args.stargazers_url, args.max_profiles)
+        profile_urls = get_profiles_from_stargazers(
+            client,
+            args.stargazers_url,
+            args.max_profiles,
+            should_stop=lambda: not scheduler.request_allowed(),
+        )
 
     if not profile_urls:
         logger.error("No profile URLs to process. Exiting.")
         return
 
-    profiles = scrape_profiles(client, profile_urls, max_profiles=args.max_profiles)
-
     os.makedirs(os.path.dirname(args.output), exist_ok=True)
-    if args.format == "json":
-        export_to_json(profiles, args.output)
-    else:
-        export_to_csv(profiles, args.output)
+    # Records are exported as they are scraped, so memory stays flat on large runs.
+    profiles = scheduler.run(profile_urls, max_profiles=args.max_profiles)
+    try:
+        if args.format == "json":
+            written = export_to_json(profiles, args.output, compress=args.compress)
+        else:
+            written = export_to_csv(profiles, args.output, compress=args.compress)
+        logger.info("Done. Wrote %d profiles to %s (%s).", written, args.output, args.format)
+    finally:
+        # Also runs on a crash or Ctrl-C, so the remaining work can be resumed.
+        profiles.close()
+        if scheduler.unprocessed and scheduler.stop_reason != "max_profiles":
+            write_unprocessed(scheduler.unprocessed, args.unprocessed_output or f"{args.output}.unprocessed.txt")
 
-    logger.info("Done. Wrote %d profiles to %s (%s).", len(profiles), args.output, args.format)
+def write_unprocessed(urls: List[str], path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for url in urls:
+            f.write(url + "\n")
+    logger.info("Wrote %d unprocessed URLs to %s", len(urls), path)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,156 @@
+import gzip
+import io
+import logging
+import queue
+import threading
+import time
+from typing import IO, Any, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd support is optional
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSIONS = ["none", "gzip", "zstd"]
+
+_EXTENSIONS = {".gz": "gzip", ".gzip": "gzip", ".zst": "zstd", ".zstd": "zstd"}
+
+# Chunks handed to the compression thread; the bounded queue caps memory if
+# the compressor falls behind.
+_CHUNK_SIZE = 1 << 20
+_QUEUE_CHUNKS = 16
+
+def infer_compression(path: str, compress: Optional[str] = None) -> str:
+    """
+    Return the compression to use: the explicit choice, or one inferred from the file extension.
+    """
+    if compress:
+        if compress not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression: {compress}")
+        return compress
+    for ext, name in _EXTENSIONS.items():
+        if path.lower().endswith(ext):
+            return name
+    return "none"
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise RuntimeError("zstd compression requires the 'zstandard' package (pip install zstandard)")
+
+class BackgroundCompressor(io.RawIOBase):
+    """
+    Binary sink that compresses and writes on a background thread.
+
+    `write` only enqueues the data, so the caller never waits on compression
+    unless the queue is full. zstd additionally compresses with all cores via
+    zstandard's multi-threaded mode.
+    """
+
+    def __init__(self, path: str, compression: str, level: Optional[int] = None) -> None:
+        super().__init__()
+        self.path = path
+        self.compression = compression
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.compress_seconds = 0.0
+        self._raw = open(path, "wb")
+        if compression == "gzip":
+            self._stream: Any = gzip.GzipFile(fileobj=self._raw, mode="wb", compresslevel=level or 6)
+        elif compression == "zstd":
+            _require_zstandard()
+            compressor = zstandard.ZstdCompressor(level=level or 3, threads=-1)
+            self._stream = compressor.stream_writer(self._raw, closefd=False)
+        else:
+            self._raw.close()
+            raise ValueError(f"Unsupported compression for background writer: {compression}")
+
+        self._queue: "queue.Queue[Optional[bytes]]" = queue.Queue(maxsize=_QUEUE_CHUNKS)
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name=f"compress-{compression}", daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            if self._error is not None:
+                continue
+            started = time.perf_counter()
+            try:
+                self._stream.write(chunk)
+            except BaseException as e:
+                self._error = e
+            self.compress_seconds += time.perf_counter() - started
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise IOError(f"Compression to {self.path} failed: {self._error}") from self._error
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._check()
+        chunk = bytes(data)
+        self.bytes_in += len(chunk)
+        self._queue.put(chunk)
+        return len(chunk)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        try:
+            started = time.perf_counter()
+            self._stream.close()
+            self.compress_seconds += time.perf_counter() - started
+        finally:
+            self.bytes_out = self._raw.tell()
+            self._raw.close()
+            super().close()
+        self._check()
+
+        stats = self.stats()
+        logger.info(
+            "Compressed %s with %s: %.1f MB -> %.1f MB (ratio %.1fx, %.1f MB/s)",
+            self.path, self.compression, stats["bytes_in"] / 1e6, stats["bytes_out"] / 1e6,
+            stats["ratio"], stats["mb_per_second"],
+        )
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Compression ratio and throughput; `bytes_out` is only final after close().
+        """
+        return {
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": self.bytes_in / self.bytes_out if self.bytes_out else 0.0,
+            "mb_per_second": self.bytes_in / self.compress_seconds / 1e6 if self.compress_seconds else 0.0,
+        }
+
+def open_output(path: str, compress: Optional[str] = None, newline: Optional[str] = None) -> IO[str]:
+    """
+    Open a text file for writing, compressing on a background thread for gzip/zstd outputs.
+    """
+    compression = infer_compression(path, compress)
+    if compression == "none":
+        return open(path, "w", encoding="utf-8", newline=newline)
+    sink = BackgroundCompressor(path, compression)
+    return io.TextIOWrapper(io.BufferedWriter(sink, buffer_size=_CHUNK_SIZE), encoding="utf-8", newline=newline)
+
+def open_input(path: str, compress: Optional[str] = None, newline: Optional[str] = None) -> IO[str]:
+    """
+    Open a possibly compressed text file for reading.
+    """
+    compression = infer_compression(path, compress)
+    if compression == "gzip":
+        return gzip.open(path, "rt", encoding="utf-8", newline=newline)
+    if compression == "zstd":
+        _require_zstandard()
+        reader = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+        return io.TextIOWrapper(io.BufferedReader(reader), encoding="utf-8", newline=newline)
+    return open(path, "r", encoding="utf-8", newline=newline)
@@ -1,7 +1,9 @@
 import csv
 import json
 import logging
-from typing import List, Dict, Any
+from typing import Iterable, Dict, Any, Optional
+
+from outputs.compression import open_output
 
 logger = logging.getLogger(__name__)
 
@@ -26,13 +28,16 @@ def _serialize_value(value: Any) -> str:
         return json.dumps(value, ensure_ascii=False)
     return str(value) if value is not None else ""
 
-def export_to_csv(records: List[Dict[str, Any]], path: str) -> None:
+def export_to_csv(records: Iterable[Dict[str, Any]], path: str, compress: Optional[str] = None) -> int:
     """
-    Export list of profile records to a CSV file.
+    Export profile records to a CSV file, writing each record as it arrives.
     Lists and nested structures are JSON-encoded.
+    Output is compressed when `compress` is set or the path ends in .gz/.zst.
+    Returns the number of records written.
     """
+    count = 0
     try:
-        with open(path, "w", encoding="utf-8", newline="") as f:
+        with open_output(path, compress, newline="") as f:
             writer = csv.DictWriter(f, fieldnames=CORE_FIELDS)
             writer.writeheader()
 
@@ -41,8 +46,10 @@ def export_to_csv(records: List[Dict[str, Any]], path: str) -> None:
                 for field in CORE_FIELDS:
                     row[field] = _serialize_value(record.get(field, ""))
                 writer.writerow(row)
+                count += 1
 
-        logger.info("Exported %d records to CSV file %s", len(records), path)
+        logger.info("Exported %d records to CSV file %s", count, path)
+        return count
     except Exception as e:
         logger.exception("Failed to export CSV to %s: %s", path, e)
         raise
\ No newline at end of file
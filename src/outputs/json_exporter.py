@@ -1,17 +1,43 @@
 import json
 import logging
-from typing import List, Dict, Any
+from typing import Iterable, Dict, Any, Optional
+
+from outputs.compression import open_output
 
 logger = logging.getLogger(__name__)
 
-def export_to_json(records: List[Dict[str, Any]], path: str) -> None:
+def export_to_json(
+    records: Iterable[Dict[str, Any]],
+    path: str,
+    compress: Optional[str] = None,
+    pretty: bool = True,
+) -> int:
     """
-    Export list of profile records to a JSON file.
+    Export profile records to a JSON file, writing each record as it arrives.
+    Output is compressed when `compress` is set or the path ends in .gz/.zst.
+    If `records` raises part-way, the array is still closed so the file holds
+    valid JSON with every record written so far. With `pretty=False` each
+    record is written compactly on its own line, which uses json's C encoder
+    and is several times faster on large files. Returns the number of records written.
     """
+    count = 0
     try:
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(records, f, ensure_ascii=False, indent=2)
-        logger.info("Exported %d records to JSON file %s", len(records), path)
+        with open_output(path, compress) as f:
+            # Pretty output has the same layout as json.dump(records, indent=2), without holding the list in memory
+            f.write("[")
+            try:
+                for record in records:
+                    if pretty:
+                        f.write(",\n  " if count else "\n  ")
+                        f.write(json.dumps(record, ensure_ascii=False, indent=2).replace("\n", "\n  "))
+                    else:
+                        f.write(",\n" if count else "\n")
+                        f.write(json.dumps(record, ensure_ascii=False))
+                    count += 1
+            finally:
+                f.write("\n]" if count else "]")
+        logger.info("Exported %d records to JSON file %s", count, path)
+        return count
     except Exception as e:
         logger.exception("Failed to export JSON to %s: %s", path, e)
         raise
\ No newline at end of file
@@ -0,0 +1,74 @@
+import json
+import logging
+from typing import Iterator, Dict, Any, Optional
+
+from outputs.compression import open_input
+
+logger = logging.getLogger(__name__)
+
+_READ_SIZE = 1 << 20
+# A record that still fails to decode after buffering this many characters is treated as malformed.
+_MAX_RECORD_SIZE = 8 * _READ_SIZE
+_WHITESPACE = " \t\r\n"
+
+def iter_json_records(path: str, compress: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from a JSON array file (as written by export_to_json) one at a time.
+    Compressed files are read transparently. Raises ValueError with the
+    character offset if a record cannot be decoded within _MAX_RECORD_SIZE.
+    """
+    decoder = json.JSONDecoder()
+    with open_input(path, compress) as f:
+        buf = ""
+        pos = 0
+        # Characters already dropped from the front of buf, for error offsets
+        consumed = 0
+        eof = False
+        started = False
+
+        def fill() -> bool:
+            nonlocal buf, pos, eof, consumed
+            if len(buf) - pos >= _MAX_RECORD_SIZE:
+                raise ValueError(
+                    f"Malformed JSON record at character offset {consumed + pos} in {path}: "
+                    f"no complete value within {_MAX_RECORD_SIZE} characters"
+                )
+            chunk = f.read(_READ_SIZE)
+            if not chunk:
+                eof = True
+                return False
+            consumed += pos
+            buf = buf[pos:] + chunk
+            pos = 0
+            return True
+
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE + ("," if started else ""):
+                pos += 1
+            if pos >= len(buf):
+                if eof or not fill():
+                    raise ValueError(f"Unexpected end of JSON array in {path}")
+                continue
+
+            if not started:
+                if buf[pos] != "[":
+                    raise ValueError(f"Expected a JSON array in {path}")
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == "]":
+                return
+
+            try:
+                record, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                # Most likely the record is split across reads; fetch more and retry.
+                if eof or not fill():
+                    raise
+                continue
+            if end == len(buf) and not eof:
+                # A number or literal could continue in the next chunk
+                if fill():
+                    continue
+            pos = end
+            yield record
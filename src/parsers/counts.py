@@ -0,0 +1,38 @@
+from typing import Any, Optional
+
+_SUFFIXES = {"k": 1_000, "m": 1_000_000, "b": 1_000_000_000}
+
+def parse_count(value: Any) -> Optional[float]:
+    """
+    Turn a displayed count like "19.9k", "1,444" or "1200" into a number.
+    """
+    text = str(value or "").strip().lower().replace(",", "")
+    if not text:
+        return None
+    multiplier = 1
+    if text[-1] in _SUFFIXES:
+        multiplier = _SUFFIXES[text[-1]]
+        text = text[:-1]
+    try:
+        return float(text) * multiplier
+    except ValueError:
+        return None
+
+def _precision(value: Any) -> float:
+    # "19.9k" only pins the count down to the nearest 100; exact counts to 1.
+    # GitHub drops a trailing ".0", so "1k" is as precise as "1.2k".
+    text = str(value or "").strip().lower().replace(",", "")
+    if not text or text[-1] not in _SUFFIXES:
+        return 1
+    decimals = len(text[:-1].partition(".")[2])
+    return _SUFFIXES[text[-1]] / 10 ** max(decimals, 1)
+
+def counts_equal(a: Any, b: Any) -> bool:
+    """
+    Compare two displayed counts, allowing for the rounding in abbreviated
+    forms, so the HTML page's "1.2k" matches the API's exact "1200".
+    """
+    left, right = parse_count(a), parse_count(b)
+    if left is None or right is None:
+        return (a or "") == (b or "")
+    return abs(left - right) < max(_precision(a), _precision(b))
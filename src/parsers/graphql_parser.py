@@ -0,0 +1,117 @@
+import logging
+from dataclasses import asdict
+from typing import List, Dict, Any, Optional
+
+from parsers.profile_parser import GithubProfile, PinnedRepo
+
+logger = logging.getLogger(__name__)
+
+# Selection set requested for every user in a batched GraphQL query.
+USER_FIELDS = """
+  login
+  name
+  bio
+  location
+  company
+  email
+  websiteUrl
+  twitterUsername
+  followers { totalCount }
+  following { totalCount }
+  socialAccounts(first: 10) { nodes { provider url } }
+  organizations(first: 100) { nodes { url } }
+  sponsoring(first: 100) { nodes { ... on User { url } ... on Organization { url } } }
+  contributionsCollection {
+    contributionYears
+    contributionCalendar { totalContributions }
+  }
+  pinnedItems(first: 6, types: REPOSITORY) {
+    nodes {
+      ... on Repository {
+        name
+        url
+        description
+        stargazerCount
+        forkCount
+        languages(first: 10) { nodes { name } }
+      }
+    }
+  }
+"""
+
+# Profile fields that the GraphQL API does not expose; these stay empty
+# unless they are filled in from the HTML page.
+HTML_ONLY_FIELDS = ["achievements", "highlights", "readme"]
+
+def _count(value: Optional[Dict[str, Any]]) -> str:
+    if not value or value.get("totalCount") is None:
+        return ""
+    return str(value["totalCount"])
+
+def _nodes(value: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if not value:
+        return []
+    return [node for node in value.get("nodes") or [] if node]
+
+def _extract_pinned_repos(user: Dict[str, Any]) -> List[PinnedRepo]:
+    repos: List[PinnedRepo] = []
+    for node in _nodes(user.get("pinnedItems")):
+        repos.append(
+            PinnedRepo(
+                name=node.get("name") or "",
+                url=node.get("url") or "",
+                description=node.get("description") or "",
+                languages=[lang["name"] for lang in _nodes(node.get("languages")) if lang.get("name")],
+                stars=str(node.get("stargazerCount", "")),
+                forks=str(node.get("forkCount", "")),
+            )
+        )
+    return repos
+
+def parse_graphql_user(user: Dict[str, Any], profile_url: str) -> Dict[str, Any]:
+    """
+    Map a GraphQL `user` object into the same record schema as parse_profile_html.
+    """
+    contributions = user.get("contributionsCollection") or {}
+    calendar = contributions.get("contributionCalendar") or {}
+    total = calendar.get("totalContributions")
+    years = [str(y) for y in contributions.get("contributionYears") or []]
+
+    linkedin_link = ""
+    for account in _nodes(user.get("socialAccounts")):
+        if (account.get("provider") or "").upper() == "LINKEDIN":
+            linkedin_link = account.get("url") or ""
+
+    twitter = user.get("twitterUsername") or ""
+    website = user.get("websiteUrl") or ""
+    email = user.get("email") or ""
+
+    profile = GithubProfile(
+        user=profile_url,
+        name=user.get("name") or "",
+        username=user.get("login") or "",
+        followers=_count(user.get("followers")),
+        following=_count(user.get("following")),
+        bio=" ".join((user.get("bio") or "").split()),
+        location=user.get("location") or "",
+        emails=[email] if email else [],
+        organization=user.get("company") or "",
+        websites=[website] if website else [],
+        achievements=[],
+        sponsoring=sorted(node["url"] for node in _nodes(user.get("sponsoring")) if node.get("url")),
+        # Match the "1,444" formatting shown on the profile page
+        last_year_contribution_number=f"{total:,}" if total is not None else "",
+        X=f"https://twitter.com/{twitter}" if twitter else "",
+        LinkedIn=linkedin_link,
+        highlights=[],
+        organization_followed=sorted(node["url"] for node in _nodes(user.get("organizations")) if node.get("url")),
+        first_year_commit=min(years) if years else "",
+        pinned_repos=_extract_pinned_repos(user),
+        readme=[],
+    )
+
+    profile_dict = asdict(profile)
+    profile_dict["pinned_repos"] = [asdict(repo) for repo in profile.pinned_repos]
+
+    logger.debug("Parsed GraphQL profile for %s: %s", profile_url, profile_dict)
+    return profile_dict
@@ -0,0 +1,117 @@
+import argparse
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple
+
+from archive import latest_entries, read_pages
+from outputs.compression import COMPRESSIONS
+from outputs.csv_exporter import export_to_csv
+from outputs.json_exporter import export_to_json
+from parsers.profile_parser import parse_profile_html
+
+logger = logging.getLogger(__name__)
+
+# Pages parsed per worker task; small enough to keep results flowing and memory flat.
+DEFAULT_TASK_PAGES = 500
+
+def _parse_task(directory: str, segment: str, entries: List[Tuple[int, int, str]]) -> List[Dict[str, Any]]:
+    profiles: List[Dict[str, Any]] = []
+    for url, html in read_pages(directory, segment, entries):
+        try:
+            profiles.append(parse_profile_html(html, url))
+        except Exception as e:
+            logger.exception("Failed to re-parse archived page %s: %s", url, e)
+    return profiles
+
+def _tasks(directory: str, task_pages: int) -> Iterator[Tuple[str, str, List[Tuple[int, int, str]]]]:
+    for segment, entries in sorted(latest_entries(directory).items()):
+        for start in range(0, len(entries), task_pages):
+            yield directory, segment, entries[start:start + task_pages]
+
+def reparse_archive(
+    directory: str,
+    workers: Optional[int] = None,
+    task_pages: int = DEFAULT_TASK_PAGES,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Re-run the current profile parser over the newest archived copy of every page, without network access.
+
+    Segments are split into tasks of `task_pages` pages and parsed across
+    `workers` processes (default: CPU count). Only a bounded window of tasks
+    is in flight, and results are yielded in archive order.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = _tasks(directory, task_pages)
+
+    if workers == 1:
+        for task in tasks:
+            yield from _parse_task(*task)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: Deque[Future] = deque()
+        for task in tasks:
+            pending.append(pool.submit(_parse_task, *task))
+            if len(pending) >= workers * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        prog="main.py reparse",
+        description="Re-parse archived profile pages with the current parsers, without network access.",
+    )
+    parser.add_argument("command", choices=["reparse"], help=argparse.SUPPRESS)
+    parser.add_argument("--archive-dir", required=True, help="Page archive directory written by a scrape run.")
+    parser.add_argument("--output", required=True, help="Output file path.")
+    parser.add_argument(
+        "--format",
+        choices=["json", "csv"],
+        default="json",
+        help="Output format: json or csv (default: json).",
+    )
+    parser.add_argument(
+        "--compress",
+        choices=COMPRESSIONS,
+        default=None,
+        help="Compress output: none, gzip or zstd (default: inferred from a .gz/.zst output extension).",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Parser processes to run (default: CPU count).",
+    )
+    parser.add_argument(
+        "--log-level",
+        default="INFO",
+        choices=["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"],
+        help="Logging level (default: INFO).",
+    )
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> None:
+    args = parse_args(argv)
+    logging.basicConfig(
+        level=getattr(logging, args.log_level.upper(), logging.INFO),
+        format="%(asctime)s [%(levelname)s] %(name)s - %(message)s",
+    )
+    if args.workers is not None and args.workers < 1:
+        raise SystemExit("--workers must be at least 1")
+
+    started = time.perf_counter()
+    profiles = reparse_archive(args.archive_dir, workers=args.workers)
+    if args.format == "json":
+        written = export_to_json(profiles, args.output, compress=args.compress, pretty=False)
+    else:
+        written = export_to_csv(profiles, args.output, compress=args.compress)
+
+    elapsed = time.perf_counter() - started
+    logger.info(
+        "Re-parsed %d archived profiles into %s in %.1fs (%.0f pages/s)",
+        written, args.output, elapsed, written / elapsed if elapsed else 0.0,
+    )
@@ -0,0 +1,220 @@
+import logging
+import os
+import time
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from fetch_backends import FetchBackend, GraphqlBackend
+from github_client import GithubClient, RequestBudgetExceeded
+from outputs.json_reader import iter_json_records
+from parsers.counts import parse_count
+from scraper import iter_profiles
+
+logger = logging.getLogger(__name__)
+
+PRIORITIES = ["input", "followers"]
+
+_DURATION_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+
+def parse_duration(value: str) -> float:
+    """
+    Parse a duration such as "90", "45s", "30m" or "2h" into seconds.
+    """
+    text = value.strip().lower()
+    unit = 1
+    if text and text[-1] in _DURATION_UNITS:
+        unit = _DURATION_UNITS[text[-1]]
+        text = text[:-1]
+    try:
+        seconds = float(text) * unit
+    except ValueError:
+        raise ValueError(f"Invalid duration: {value!r}") from None
+    if seconds <= 0:
+        raise ValueError(f"Duration must be positive: {value!r}")
+    return seconds
+
+def _login_key(url: str) -> str:
+    return GraphqlBackend.login_from_url(url).lower()
+
+def load_follower_cache(path: str) -> Dict[str, float]:
+    """
+    Build a login -> follower count map from a previous JSON output file.
+    The file is streamed, so only the map itself is held in memory.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Priority cache not found: {path}")
+
+    cache: Dict[str, float] = {}
+    for record in iter_json_records(path):
+        count = parse_count(record.get("followers"))
+        login = record.get("username") or _login_key(record.get("user", ""))
+        if login and count is not None:
+            cache[login.lower()] = count
+    logger.info("Loaded cached follower counts for %d profiles from %s", len(cache), path)
+    return cache
+
+class WorkScheduler:
+    """
+    Bound a scrape run by a wall-clock deadline and a request budget, in priority order.
+
+    The scheduler orders the URLs and drives iter_profiles, acting as its
+    limiter. Before each batch it projects the per-profile time and request
+    cost measured so far and shrinks the batch to what still fits, stopping
+    cleanly once nothing does; until a first batch has been measured it runs
+    one profile at a time. The deadline is measured from `started_at`, so
+    work done before the run (such as stargazers discovery) counts too.
+    The budget is also set as the client's hard request limit, so retries
+    and fallbacks the projection did not foresee cannot overrun it; a batch
+    cut short that way goes back to `unprocessed`. Profiles that were never
+    attempted are left in `unprocessed`, in priority order, once iteration ends.
+    """
+
+    def __init__(
+        self,
+        client: GithubClient,
+        backend: FetchBackend,
+        deadline: Optional[float] = None,
+        request_budget: Optional[int] = None,
+        priority: str = "input",
+        follower_cache: Optional[Dict[str, float]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        started_at: Optional[float] = None,
+    ) -> None:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority: {priority}")
+        if priority == "followers" and follower_cache is None:
+            raise ValueError("priority 'followers' requires a follower cache")
+        self.client = client
+        self.backend = backend
+        self.deadline = deadline
+        self.request_budget = request_budget
+        self.priority = priority
+        self.follower_cache = follower_cache or {}
+        self.clock = clock
+        self.started_at = clock() if started_at is None else started_at
+        if request_budget is not None:
+            client.request_limit = request_budget
+
+        self.unprocessed: List[str] = []
+        self.stop_reason: Optional[str] = None
+        self._total = 0
+        self._attempted = 0
+        self._run_started = self.started_at
+        self._run_requests = client.request_count
+        # URLs handed to the current batch but not yet attempted
+        self._in_flight: List[str] = []
+
+    def _priority_key(self, rank: int, url: str) -> Tuple[float, int]:
+        if self.priority == "followers":
+            # Most-followed first; profiles missing from the cache go last in input order.
+            followers = self.follower_cache.get(_login_key(url))
+            return (-followers if followers is not None else float("inf"), rank)
+        return (rank, rank)
+
+    def order(self, profile_urls: Iterable[str]) -> List[str]:
+        """
+        Return the URLs in the order they should be processed.
+        """
+        keyed = sorted((self._priority_key(rank, url), url) for rank, url in enumerate(profile_urls))
+        return [url for _, url in keyed]
+
+    def request_allowed(self) -> bool:
+        """
+        Whether one more request fits within the deadline and budget; used during discovery.
+        """
+        if self.deadline is not None and self.clock() - self.started_at >= self.deadline:
+            self.stop_reason = "deadline"
+            return False
+        if self.request_budget is not None and self.client.request_count + 1 > self.request_budget:
+            self.stop_reason = "request budget"
+            return False
+        return True
+
+    def batch_limit(self, size: int) -> int:
+        """
+        Shrink the next batch to what fits in the remaining time and requests.
+        """
+        if not self._attempted:
+            # No measured cost yet: probe with a single profile.
+            size = min(size, 1)
+
+        if self.deadline is not None:
+            remaining = self.deadline - (self.clock() - self.started_at)
+            if remaining <= 0:
+                size = 0
+            elif self._attempted:
+                per_profile = (self.clock() - self._run_started) / self._attempted
+                if per_profile > 0:
+                    size = min(size, int(remaining // per_profile))
+            if size <= 0:
+                self.stop_reason = "deadline"
+                return 0
+
+        if self.request_budget is not None:
+            remaining_requests = self.request_budget - self.client.request_count
+            per_profile = (self.client.request_count - self._run_requests) / self._attempted if self._attempted else 1
+            if per_profile > 0:
+                size = min(size, int(remaining_requests // per_profile))
+            elif remaining_requests <= 0:
+                size = 0
+            if size <= 0:
+                self.stop_reason = "request budget"
+                return 0
+
+        return size
+
+    def batch_done(self, attempted: int) -> None:
+        self._attempted += attempted
+        self._in_flight.clear()
+
+        elapsed = self.clock() - self._run_started
+        rate = self._attempted / elapsed if elapsed > 0 else 0.0
+        eta = (self._total - self._attempted) / rate if rate > 0 else 0.0
+        logger.info(
+            "(%d/%d) %.2f profiles/s, %d requests used, estimated %.0fs remaining",
+            self._attempted, self._total, rate, self.client.request_count - self._run_requests, eta,
+        )
+
+    def _track(self, urls: Iterator[str]) -> Iterator[str]:
+        for url in urls:
+            self._in_flight.append(url)
+            yield url
+
+    def run(self, profile_urls: Iterable[str], max_profiles: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Yield scraped profile records in priority order until the work, the deadline or the budget runs out.
+        """
+        ordered = self.order(profile_urls)
+        remaining = iter(ordered)
+        self._total = len(ordered)
+        self._attempted = 0
+        self._in_flight = []
+        self._run_started = self.clock()
+        self._run_requests = self.client.request_count
+        self.unprocessed = []
+        self.stop_reason = None
+
+        finished = False
+        try:
+            yield from iter_profiles(
+                self._track(remaining),
+                client=self.client,
+                max_profiles=max_profiles,
+                backend=self.backend,
+                limiter=self,
+            )
+            finished = True
+        except RequestBudgetExceeded as e:
+            # The batch in flight was cut short; none of it counts as done.
+            logger.warning("%s", e)
+            self.stop_reason = "request budget"
+        finally:
+            self.unprocessed = self._in_flight + list(remaining)
+            if self.unprocessed and self.stop_reason is None:
+                # iter_profiles only ends early on its own when max_profiles is reached
+                self.stop_reason = "max_profiles" if finished else "interrupted"
+
+        if self.stop_reason and self.stop_reason != "max_profiles":
+            logger.warning(
+                "Stopped early (%s) after %d profiles; %d left unprocessed",
+                self.stop_reason, self._attempted, len(self.unprocessed),
+            )
@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import threading
+from dataclasses import dataclass
+from itertools import islice
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Optional, Protocol, Union
+
+from fetch_backends import FetchBackend, HtmlBackend
+from github_client import GithubClient
+from parsers.stargazers_parser import extract_stargazer_profiles
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class StargazersSource:
+    """
+    Profile source that lazily discovers users from a repository's stargazers pages.
+    """
+    url: str
+
+ProfileSource = Union[Iterable[str], StargazersSource]
+
+class RunLimiter(Protocol):
+    """
+    Hook that lets a caller such as WorkScheduler bound a scrape run.
+    """
+
+    def batch_limit(self, size: int) -> int:
+        """
+        Return how many of the next `size` profiles may be fetched; 0 stops the run.
+        """
+        ...
+
+    def batch_done(self, attempted: int) -> None:
+        """
+        Called after each batch with the number of profiles attempted.
+        """
+        ...
+
+    def request_allowed(self) -> bool:
+        """
+        Whether one more request (e.g. a stargazers page) fits in the run's limits.
+        """
+        ...
+
+def iter_stargazer_urls(
+    client: GithubClient,
+    url: str,
+    should_stop: Optional[Callable[[], bool]] = None,
+) -> Iterator[str]:
+    """
+    Yield profile URLs from a stargazers URL, fetching the next page only when needed.
+    `should_stop` is checked before every page fetch.
+    """
+    logger.info("Discovering profiles from stargazers URL: %s", url)
+    pages = client.fetch_stargazers_pages(url)
+    while True:
+        if should_stop is not None and should_stop():
+            logger.warning("Stopped stargazers discovery early for %s", url)
+            return
+        page_html = next(pages, None)
+        if page_html is None:
+            return
+        for profile_url in extract_stargazer_profiles(page_html):
+            yield profile_url
+
+def _iter_source_urls(client: GithubClient, source: ProfileSource, limiter: Optional[RunLimiter]) -> Iterator[str]:
+    if isinstance(source, StargazersSource):
+        should_stop = (lambda: not limiter.request_allowed()) if limiter is not None else None
+        return iter_stargazer_urls(client, source.url, should_stop=should_stop)
+    if isinstance(source, str):
+        # A bare string would otherwise be iterated character by character.
+        raise TypeError("source must be an iterable of URLs or a StargazersSource, not a str")
+    return iter(source)
+
+def iter_profiles(
+    source: ProfileSource,
+    client: Optional[GithubClient] = None,
+    max_profiles: Optional[int] = None,
+    cancel: Optional[threading.Event] = None,
+    backend: Optional[FetchBackend] = None,
+    limiter: Optional[RunLimiter] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield parsed profile records one at a time as they are scraped.
+
+    Work is driven by the consumer: the next batch of profiles (and, for a
+    StargazersSource, the next stargazers page) is only fetched when the
+    caller asks for another record, so memory use stays constant regardless
+    of input size. Setting `cancel` or closing the generator stops the run
+    before the next fetch, and a `limiter` can shrink or stop each batch.
+    Profiles that fail to scrape are logged and skipped.
+    """
+    client = client or GithubClient()
+    backend = backend or HtmlBackend(client)
+    total = len(source) if hasattr(source, "__len__") and not isinstance(source, str) else None
+    urls = _iter_source_urls(client, source, limiter)
+    seen = 0
+    scraped = 0
+
+    while max_profiles is None or scraped < max_profiles:
+        if cancel is not None and cancel.is_set():
+            logger.info("Scrape cancelled after %d profiles", scraped)
+            return
+
+        size = backend.batch_size
+        if max_profiles is not None:
+            size = min(size, max_profiles - scraped)
+        if limiter is not None:
+            size = limiter.batch_limit(size)
+            if size <= 0:
+                return
+        # Pull only as many URLs as the next batch needs, so no extra source pages are fetched.
+        batch = list(islice(urls, size))
+        if not batch:
+            return
+
+        for url in batch:
+            seen += 1
+            if total is not None:
+                logger.info("(%d/%d) Fetching profile: %s", seen, total, url)
+            else:
+                logger.info("(%d) Fetching profile: %s", seen, url)
+
+        results = backend.fetch_batch(batch)
+        if limiter is not None:
+            limiter.batch_done(len(batch))
+        for url, result in results:
+            if isinstance(result, Exception):
+                logger.error("Failed to scrape profile %s: %s", url, result, exc_info=result)
+                continue
+            scraped += 1
+            yield result
+
+    logger.info("Reached max_profiles limit: %d", max_profiles)
+
+async def aiter_profiles(
+    source: ProfileSource,
+    client: Optional[GithubClient] = None,
+    max_profiles: Optional[int] = None,
+    cancel: Optional[threading.Event] = None,
+    backend: Optional[FetchBackend] = None,
+) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Async-iterator variant of iter_profiles.
+
+    Each blocking fetch runs in a worker thread, so the event loop stays free
+    while a profile is being scraped. Cancelling the consuming task or closing
+    the iterator stops the run once the in-flight fetch returns.
+    """
+    cancel = cancel or threading.Event()
+    profiles = iter_profiles(source, client=client, max_profiles=max_profiles, cancel=cancel, backend=backend)
+    done = object()
+    try:
+        while True:
+            profile = await asyncio.to_thread(next, profiles, done)
+            if profile is done:
+                break
+            yield profile
+    finally:
+        cancel.set()
+        try:
+            profiles.close()
+        except ValueError:
+            # The worker thread is still inside the generator; it will see
+            # the cancel flag and stop on its own.
+            pass
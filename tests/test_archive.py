@@ -0,0 +1,71 @@
+import os
+import sys
+
+# Ensure src is importable when running pytest from repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from archive import PageArchive, iter_index, read_page  # type: ignore
+from github_client import GithubClient  # type: ignore
+from reparse import reparse_archive  # type: ignore
+
+def _html(username, bio=""):
+    return (
+        "<html><body>"
+        f"<span class='p-nickname'>{username}</span>"
+        f"<div class='p-note'>{bio}</div>"
+        "</body></html>"
+    )
+
+def _fill(directory, count, segment_max_bytes=400):
+    with PageArchive(directory, segment_max_bytes=segment_max_bytes) as archive:
+        for i in range(count):
+            archive.append(f"https://github.com/user{i}", _html(f"user{i}"))
+
+def test_archive_appends_segments_and_index(tmp_path):
+    directory = str(tmp_path / "archive")
+    _fill(directory, 10)
+
+    entries = list(iter_index(directory))
+    assert len(entries) == 10
+    assert len({e["segment"] for e in entries}) > 1
+    assert read_page(directory, "https://github.com/user7") == _html("user7")
+    assert read_page(directory, "https://github.com/nobody") is None
+
+    # Reopening never rewrites existing segments
+    before = sorted(os.listdir(directory))
+    with PageArchive(directory) as archive:
+        archive.append("https://github.com/user3", _html("user3", "updated bio"))
+    after = sorted(os.listdir(directory))
+    assert set(before) < set(after)
+    assert "updated bio" in read_page(directory, "https://github.com/user3")
+
+def test_reparse_uses_latest_copy_of_each_page(tmp_path):
+    directory = str(tmp_path / "archive")
+    _fill(directory, 25)
+    with PageArchive(directory) as archive:
+        archive.append("https://github.com/user3", _html("user3", "updated bio"))
+
+    serial = list(reparse_archive(directory, workers=1, task_pages=4))
+    parallel = list(reparse_archive(directory, workers=2, task_pages=4))
+
+    assert len(serial) == 25
+    assert sorted(p["user"] for p in parallel) == sorted(p["user"] for p in serial)
+    by_user = {p["user"]: p for p in serial}
+    assert by_user["https://github.com/user3"]["bio"] == "updated bio"
+    assert by_user["https://github.com/user12"]["username"] == "user12"
+
+def test_client_archives_pages_under_resolved_url(tmp_path, monkeypatch):
+    directory = str(tmp_path / "archive")
+    with PageArchive(directory) as archive:
+        client = GithubClient(settings={}, archive=archive)
+        monkeypatch.setattr(client, "_request", lambda url: _html("alice"))
+        for profile in ["/alice", "alice", "https://github.com/alice"]:
+            client.fetch_profile_html(profile)
+
+    entries = list(iter_index(directory))
+    assert {e["url"] for e in entries} == {"https://github.com/alice"}
+    assert [e.get("requested_url") for e in entries] == ["/alice", "alice", None]
+    assert [p["user"] for p in reparse_archive(directory, workers=1)] == ["https://github.com/alice"]
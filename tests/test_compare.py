@@ -0,0 +1,123 @@
+import os
+import sys
+
+import pytest
+
+# Ensure src is importable when running pytest from repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from compare import diff_outputs, external_sort, merge_outputs, record_key  # type: ignore
+from outputs.json_exporter import export_to_json  # type: ignore
+from outputs.json_reader import iter_json_records  # type: ignore
+
+def _profile(username, followers="1", location="", organization=""):
+    return {
+        "user": f"https://github.com/{username}",
+        "username": username,
+        "followers": followers,
+        "location": location,
+        "organization": organization,
+        "readme": ["line with \"quotes\" and ] brackets"],
+    }
+
+def _write(tmp_path, name, records):
+    path = str(tmp_path / name)
+    export_to_json(iter(records), path)
+    return path
+
+def test_iter_json_records_streams_export(tmp_path, monkeypatch):
+    import outputs.json_reader as json_reader  # type: ignore
+
+    # Tiny reads force records to straddle chunk boundaries
+    monkeypatch.setattr(json_reader, "_READ_SIZE", 7)
+    records = [_profile(f"user{i}") for i in range(20)]
+    path = _write(tmp_path, "out.json.gz", records)
+
+    assert list(iter_json_records(path)) == records
+    assert list(iter_json_records(_write(tmp_path, "empty.json", []))) == []
+
+def test_iter_json_records_rejects_runaway_record(tmp_path, monkeypatch):
+    import outputs.json_reader as json_reader  # type: ignore
+
+    monkeypatch.setattr(json_reader, "_READ_SIZE", 7)
+    monkeypatch.setattr(json_reader, "_MAX_RECORD_SIZE", 64)
+    path = tmp_path / "broken.json"
+    path.write_text('[{"a": 1}, {"b": "' + "x" * 1000 + "\n]", encoding="utf-8")
+
+    records = iter_json_records(str(path))
+    assert next(records) == {"a": 1}
+    with pytest.raises(ValueError, match="offset 11"):
+        next(records)
+
+def test_external_sort_spills_and_is_stable(tmp_path):
+    records = [_profile(name) for name in ["d", "B", "a", "c", "b", "e", "a"]]
+    records[-1]["followers"] = "latest"
+
+    result = list(external_sort(iter(records), chunk_records=2, tmp_dir=str(tmp_path)))
+
+    assert [record_key(r) for r in result] == ["a", "a", "b", "b", "c", "d", "e"]
+    assert result[1]["followers"] == "latest"
+    assert [r["username"] for r in result[2:4]] == ["B", "b"]
+    # Spilled runs are cleaned up
+    assert os.listdir(tmp_path) == []
+
+def test_merge_outputs_latest_wins(tmp_path):
+    week1 = _write(tmp_path, "week1.json", [_profile("bob", "5"), _profile("alice", "1")])
+    week2 = _write(tmp_path, "week2.json", [_profile("carol", "7"), _profile("alice", "2")])
+    merged = str(tmp_path / "merged.json")
+
+    written = merge_outputs([week1, week2], merged, chunk_records=1)
+
+    assert written == 3
+    result = list(iter_json_records(merged))
+    assert [(r["username"], r["followers"]) for r in result] == [("alice", "2"), ("bob", "5"), ("carol", "7")]
+
+def test_diff_outputs_reports_changes(tmp_path):
+    old = _write(tmp_path, "old.json", [
+        _profile("alice", "1", "Berlin"),
+        _profile("bob", "5"),
+        _profile("dave", "3", organization="@acme"),
+    ])
+    new = _write(tmp_path, "new.json", [
+        _profile("dave", "3", organization="@other"),
+        _profile("carol", "7"),
+        _profile("alice", "2", "Berlin"),
+    ])
+    report = str(tmp_path / "report.json")
+
+    summary = diff_outputs(old, new, report, chunk_records=2)
+
+    assert summary == {"new": 1, "removed": 1, "changed": 2, "unchanged": 0}
+    entries = {e["username"]: e for e in iter_json_records(report)}
+    assert entries["bob"]["status"] == "removed"
+    assert entries["carol"]["status"] == "new"
+    assert entries["alice"]["changes"] == {"followers": {"old": "1", "new": "2"}}
+    assert entries["dave"]["changes"] == {"organization": {"old": "@acme", "new": "@other"}}
+
+def test_diff_outputs_compares_counts_numerically(tmp_path):
+    # An HTML-scraped week ("1.2k") against a GraphQL week (exact counts)
+    old = _write(tmp_path, "old.json", [
+        _profile("alice", "1.2k"),
+        _profile("bob", "19.9k"),
+        _profile("carol", "1k"),
+        _profile("dave", "1k"),
+        _profile("erin", "2k"),
+        _profile("frank", "1m"),
+    ])
+    new = _write(tmp_path, "new.json", [
+        _profile("alice", "1234"),
+        _profile("bob", "20100"),
+        _profile("carol", "1000"),
+        _profile("dave", "1.9k"),
+        _profile("erin", "2.9k"),
+        _profile("frank", "1.8m"),
+    ])
+    report = str(tmp_path / "report.json")
+
+    summary = diff_outputs(old, new, report)
+
+    assert summary == {"new": 0, "removed": 0, "changed": 4, "unchanged": 2}
+    assert [e["username"] for e in iter_json_records(report)] == ["bob", "dave", "erin", "frank"]
@@ -0,0 +1,91 @@
+import csv
+import gzip
+import json
+import os
+import sys
+
+import pytest
+
+# Ensure src is importable when running pytest from repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from outputs.compression import infer_compression, open_input  # type: ignore
+from outputs.csv_exporter import export_to_csv  # type: ignore
+from outputs.json_exporter import export_to_json  # type: ignore
+
+RECORDS = [
+    {"user": "https://github.com/alice", "username": "alice", "readme": ["Hi", "there"], "pinned_repos": []},
+    {"user": "https://github.com/bob", "username": "bob", "readme": [], "pinned_repos": [{"name": "x"}]},
+]
+
+def test_infer_compression():
+    assert infer_compression("out.json") == "none"
+    assert infer_compression("out.json.gz") == "gzip"
+    assert infer_compression("out.csv.zst") == "zstd"
+    assert infer_compression("out.json", "gzip") == "gzip"
+    with pytest.raises(ValueError):
+        infer_compression("out.json", "brotli")
+
+def test_export_to_json_streams_same_layout_as_json_dump(tmp_path):
+    path = tmp_path / "out.json"
+
+    written = export_to_json(iter(RECORDS), str(path))
+
+    assert written == 2
+    assert path.read_text(encoding="utf-8") == json.dumps(RECORDS, ensure_ascii=False, indent=2)
+
+    export_to_json(iter([]), str(path))
+    assert path.read_text(encoding="utf-8") == "[]"
+
+def test_export_to_json_compact_layout(tmp_path):
+    path = tmp_path / "out.json"
+
+    written = export_to_json(iter(RECORDS), str(path), pretty=False)
+
+    assert written == 2
+    text = path.read_text(encoding="utf-8")
+    assert text.splitlines()[1] == json.dumps(RECORDS[0], ensure_ascii=False) + ","
+    assert json.loads(text) == RECORDS
+
+def test_export_to_json_stays_valid_when_interrupted(tmp_path):
+    path = tmp_path / "out.json.gz"
+
+    def records():
+        yield from RECORDS
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        export_to_json(records(), str(path))
+
+    with open_input(str(path)) as f:
+        assert json.load(f) == RECORDS
+
+def test_export_to_json_gzip(tmp_path):
+    path = tmp_path / "out.json.gz"
+
+    export_to_json(iter(RECORDS * 500), str(path))
+
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        assert json.load(f) == RECORDS * 500
+    assert path.stat().st_size < len(json.dumps(RECORDS * 500, indent=2)) / 10
+
+def test_export_to_json_zstd(tmp_path):
+    pytest.importorskip("zstandard")
+    path = tmp_path / "out.json"
+
+    export_to_json(iter(RECORDS), str(path), compress="zstd")
+
+    with open_input(str(path), compress="zstd") as f:
+        assert json.load(f) == RECORDS
+
+def test_export_to_csv_gzip(tmp_path):
+    path = tmp_path / "out.csv.gz"
+
+    assert export_to_csv(iter(RECORDS), str(path)) == 2
+
+    with open_input(str(path), newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert [row["username"] for row in rows] == ["alice", "bob"]
@@ -0,0 +1,172 @@
+import json
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+import requests
+
+# Ensure src is importable when running pytest from repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from fetch_backends import GraphqlBackend, HtmlBackend, create_backend  # type: ignore
+from github_client import GithubClient  # type: ignore
+
+GRAPHQL_USERS = {
+    "alice": {
+        "login": "alice",
+        "name": "Alice Example",
+        "bio": "Builds  things",
+        "location": "Berlin",
+        "company": "@acme",
+        "email": "alice@example.com",
+        "websiteUrl": "https://alice.dev",
+        "twitterUsername": "alice",
+        "followers": {"totalCount": 1200},
+        "following": {"totalCount": 7},
+        "socialAccounts": {"nodes": [{"provider": "LINKEDIN", "url": "https://www.linkedin.com/in/alice/"}]},
+        "organizations": {"nodes": [{"url": "https://github.com/acme"}]},
+        "sponsoring": {"nodes": []},
+        "contributionsCollection": {
+            "contributionYears": [2024, 2019, 2015],
+            "contributionCalendar": {"totalContributions": 1444},
+        },
+        "pinnedItems": {
+            "nodes": [
+                {
+                    "name": "tool",
+                    "url": "https://github.com/alice/tool",
+                    "description": "A tool",
+                    "stargazerCount": 42,
+                    "forkCount": 3,
+                    "languages": {"nodes": [{"name": "Python"}]},
+                }
+            ]
+        },
+    },
+}
+
+PROFILE_HTML = """
+<html><body>
+  <span class="p-nickname">alice</span>
+  <span class="Label">Pro</span>
+  <article class="markdown-body"><p>Hello from the README</p></article>
+</body></html>
+"""
+
+class StubHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body, content_type):
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests_seen.append(("POST", body))
+        if self.path == "/broken":
+            self._reply(500, "{}", "application/json")
+            return
+        data = {}
+        for key, login in body["variables"].items():
+            data["u" + key[1:]] = GRAPHQL_USERS.get(login)
+        self._reply(200, json.dumps({"data": data}), "application/json")
+
+    def do_GET(self):
+        self.requests_seen.append(("GET", self.path))
+        if self.path == "/missing":
+            self._reply(404, "Not Found", "text/plain")
+            return
+        self._reply(200, PROFILE_HTML, "text/html")
+
+@pytest.fixture
+def stub_server():
+    StubHandler.requests_seen = []
+    server = HTTPServer(("127.0.0.1", 0), StubHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+def _client(max_retries=1):
+    return GithubClient(settings={"max_retries": max_retries, "sleep_between_requests": 0})
+
+def _settings(stub_server, path="/graphql", **extra):
+    return {"graphql_url": f"{stub_server}{path}", "github_token": "test-token", **extra}
+
+def test_graphql_backend_batches_and_maps_schema(stub_server):
+    backend = GraphqlBackend(_client(), settings=_settings(stub_server))
+    urls = ["https://github.com/alice", "https://github.com/ghost"]
+
+    results = dict(backend.fetch_batch(urls))
+
+    posts = [r for r in StubHandler.requests_seen if r[0] == "POST"]
+    assert len(posts) == 1
+    assert posts[0][1]["variables"] == {"l0": "alice", "l1": "ghost"}
+    assert isinstance(results["https://github.com/ghost"], LookupError)
+
+    profile = results["https://github.com/alice"]
+    assert profile["user"] == "https://github.com/alice"
+    assert profile["username"] == "alice"
+    assert profile["bio"] == "Builds things"
+    assert profile["followers"] == "1200"
+    assert profile["last_year_contribution_number"] == "1,444"
+    assert profile["first_year_commit"] == "2015"
+    assert profile["X"] == "https://twitter.com/alice"
+    assert profile["LinkedIn"] == "https://www.linkedin.com/in/alice/"
+    assert profile["pinned_repos"][0]["stars"] == "42"
+    assert profile["readme"] == []
+
+    html_profile = HtmlBackend(_client()).fetch_profile(f"{stub_server}/alice")
+    assert set(profile) == set(html_profile)
+
+def test_graphql_backend_fills_html_only_fields(stub_server):
+    fields = ["achievements", "highlights", "readme"]
+    backend = GraphqlBackend(_client(), settings=_settings(stub_server, html_fallback_fields=fields))
+
+    [(url, profile)] = backend.fetch_batch([f"{stub_server}/alice"])
+
+    assert profile["followers"] == "1200"
+    assert profile["highlights"] == ["Pro"]
+    assert profile["readme"] == ["Hello from the README"]
+
+def test_graphql_backend_falls_back_to_html_on_failure(stub_server):
+    backend = GraphqlBackend(_client(), settings=_settings(stub_server, "/broken"))
+
+    [(url, profile)] = backend.fetch_batch([f"{stub_server}/alice"])
+
+    assert profile["username"] == "alice"
+    assert profile["followers"] == ""
+    assert ("GET", "/alice") in StubHandler.requests_seen
+
+def test_graphql_backend_requires_token(monkeypatch):
+    monkeypatch.delenv("GITHUB_TOKEN", raising=False)
+    with pytest.raises(ValueError):
+        GraphqlBackend(_client(), settings={})
+
+def test_client_errors_are_not_retried(stub_server):
+    client = _client(max_retries=3)
+
+    with pytest.raises(requests.HTTPError):
+        client.fetch_profile_html(f"{stub_server}/missing")
+
+    assert client.request_count == 1
+
+def test_create_backend_selects_by_config():
+    client = _client()
+    assert isinstance(create_backend(client, {}), HtmlBackend)
+    assert isinstance(create_backend(client, {"fetch_backend": "graphql", "github_token": "t"}), GraphqlBackend)
+    with pytest.raises(ValueError):
+        create_backend(client, {"fetch_backend": "carrier-pigeon"})
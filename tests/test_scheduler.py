@@ -0,0 +1,185 @@
+import os
+import sys
+
+import pytest
+import requests
+
+# Ensure src is importable when running pytest from repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from parsers.counts import parse_count  # type: ignore
+from fetch_backends import GraphqlBackend, HtmlBackend  # type: ignore
+from github_client import GithubClient  # type: ignore
+from outputs.json_exporter import export_to_json  # type: ignore
+from scheduler import WorkScheduler, load_follower_cache, parse_duration  # type: ignore
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class FakeClient:
+    def __init__(self):
+        self.request_count = 0
+
+class FakeBackend:
+    """
+    Each profile costs one request and `seconds_per_profile` of fake time.
+    """
+
+    def __init__(self, client, clock, batch_size=1, seconds_per_profile=1.0):
+        self.client = client
+        self.clock = clock
+        self.batch_size = batch_size
+        self.seconds_per_profile = seconds_per_profile
+
+    def fetch_batch(self, urls):
+        self.client.request_count += len(urls)
+        self.clock.now += self.seconds_per_profile * len(urls)
+        return [(url, {"user": url}) for url in urls]
+
+def _urls(*logins):
+    return [f"https://github.com/{login}" for login in logins]
+
+def _scheduler(**kwargs):
+    clock = FakeClock()
+    client = FakeClient()
+    backend = FakeBackend(client, clock, batch_size=kwargs.pop("batch_size", 1))
+    return WorkScheduler(client, backend, clock=clock, **kwargs)
+
+def _http_client(respond):
+    """
+    A real GithubClient whose session answers with `respond(method, url)` -> (status, body).
+    """
+    client = GithubClient(settings={"max_retries": 3, "sleep_between_requests": 0})
+
+    def request(method, url, **kwargs):
+        status, body = respond(method, url)
+        resp = requests.Response()
+        resp.status_code = status
+        resp.url = url
+        resp.encoding = "utf-8"
+        resp._content = body.encode("utf-8")
+        return resp
+
+    client.session.request = request
+    return client
+
+def test_parse_count_and_duration():
+    assert parse_count("19.9k") == pytest.approx(19900)
+    assert parse_count("1,444") == 1444
+    assert parse_count("") is None
+    assert parse_duration("90") == 90
+    assert parse_duration("30m") == 1800
+    assert parse_duration("2h") == 7200
+    with pytest.raises(ValueError):
+        parse_duration("soon")
+
+def test_load_follower_cache_streams_previous_output(tmp_path):
+    path = str(tmp_path / "previous.json.gz")
+    export_to_json(iter([
+        {"user": "https://github.com/Alice", "username": "Alice", "followers": "1.2k"},
+        {"user": "https://github.com/bob", "username": "", "followers": "7"},
+        {"user": "https://github.com/carol", "username": "carol", "followers": ""},
+    ]), path)
+
+    assert load_follower_cache(path) == {"alice": 1200, "bob": 7}
+
+def test_scheduler_orders_by_cached_followers():
+    scheduler = _scheduler(priority="followers", follower_cache={"b": 10, "c": 500})
+    records = list(scheduler.run(_urls("a", "b", "c", "d")))
+
+    assert [r["user"] for r in records] == _urls("c", "b", "a", "d")
+
+def test_scheduler_stops_within_request_budget():
+    scheduler = _scheduler(request_budget=5, batch_size=2)
+    records = list(scheduler.run(_urls("a", "b", "c", "d", "e", "f", "g")))
+
+    assert [r["user"] for r in records] == _urls("a", "b", "c", "d", "e")
+    assert scheduler.client.request_count <= 5
+    assert scheduler.stop_reason == "request budget"
+    assert scheduler.unprocessed == _urls("f", "g")
+
+def test_scheduler_shrinks_large_batches_to_fit_limits():
+    logins = [f"user{i}" for i in range(100)]
+
+    scheduler = _scheduler(request_budget=10, batch_size=50)
+    records = list(scheduler.run(_urls(*logins)))
+    assert len(records) == 10
+    assert scheduler.client.request_count == 10
+    assert scheduler.unprocessed == _urls(*logins[10:])
+
+    scheduler = _scheduler(deadline=5, batch_size=50)
+    records = list(scheduler.run(_urls(*logins)))
+    assert len(records) == 5
+    assert scheduler.clock.now <= 5
+    assert scheduler.stop_reason == "deadline"
+
+def test_scheduler_stops_before_deadline():
+    scheduler = _scheduler(deadline=3.5)
+    records = list(scheduler.run(_urls("a", "b", "c", "d", "e")))
+
+    assert len(records) == 3
+    assert scheduler.clock.now <= 3.5
+    assert scheduler.stop_reason == "deadline"
+    assert scheduler.unprocessed == _urls("d", "e")
+
+def test_request_budget_is_a_hard_limit_on_retries():
+    client = _http_client(lambda method, url: (500, "oops"))
+    scheduler = WorkScheduler(client, HtmlBackend(client), request_budget=2)
+
+    records = list(scheduler.run(_urls("a", "b")))
+
+    assert records == []
+    assert client.request_count == 2
+    assert scheduler.stop_reason == "request budget"
+    assert scheduler.unprocessed == _urls("a", "b")
+
+def test_request_budget_is_a_hard_limit_on_graphql_fallback():
+    posts = []
+
+    def respond(method, url):
+        if method == "POST":
+            posts.append(url)
+            # The first (measured) batch is cheap; every later one fails over to HTML.
+            return (200, '{"data": {"u0": null}}') if len(posts) == 1 else (500, "{}")
+        return 200, "<html><body><span class='p-nickname'>x</span></body></html>"
+
+    client = _http_client(respond)
+    backend = GraphqlBackend(client, settings={"github_token": "t", "graphql_batch_size": 50})
+    logins = [f"user{i}" for i in range(100)]
+    scheduler = WorkScheduler(client, backend, request_budget=10)
+
+    records = list(scheduler.run(_urls(*logins)))
+
+    assert records == []
+    assert client.request_count == 10
+    assert scheduler.stop_reason == "request budget"
+    # The failed batch is handed back whole, along with everything not yet started
+    assert scheduler.unprocessed == _urls(*logins[1:])
+
+def test_scheduler_counts_time_spent_before_the_run():
+    clock = FakeClock()
+    client = FakeClient()
+    scheduler = WorkScheduler(client, FakeBackend(client, clock), deadline=3, clock=clock, started_at=0.0)
+    clock.now = 2.0  # e.g. stargazers discovery
+
+    assert scheduler.request_allowed()
+    records = list(scheduler.run(_urls("a", "b", "c")))
+
+    assert len(records) == 1
+    assert scheduler.unprocessed == _urls("b", "c")
+    assert not scheduler.request_allowed()
+
+def test_scheduler_runs_everything_without_limits():
+    scheduler = _scheduler()
+    records = list(scheduler.run(_urls("a", "b")))
+
+    assert len(records) == 2
+    assert scheduler.stop_reason is None
+    assert scheduler.unprocessed == []
@@ -0,0 +1,130 @@
+import asyncio
+import os
+import sys
+import threading
+
+import pytest
+
+# Ensure src is importable when running pytest from repo root
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+SRC_DIR = os.path.join(ROOT_DIR, "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from scraper import StargazersSource, aiter_profiles, iter_profiles  # type: ignore
+
+class FakeClient:
+    """
+    Stands in for GithubClient and records which URLs were fetched.
+    """
+
+    def __init__(self, stargazer_pages=None, failing=()):
+        self.fetched = []
+        self.stargazer_pages = stargazer_pages or []
+        self.failing = set(failing)
+
+    def fetch_profile_html(self, url):
+        self.fetched.append(url)
+        if url in self.failing:
+            raise RuntimeError("boom")
+        login = url.rstrip("/").rsplit("/", 1)[-1]
+        return f"<html><body><span class='p-nickname'>{login}</span></body></html>"
+
+    def fetch_stargazers_pages(self, url):
+        for page in self.stargazer_pages:
+            self.fetched.append(f"stargazers:{len(self.fetched)}")
+            yield page
+
+def _urls(*logins):
+    return [f"https://github.com/{login}" for login in logins]
+
+def test_iter_profiles_is_lazy_and_skips_failures():
+    client = FakeClient(failing=_urls("bob"))
+    profiles = iter_profiles(_urls("alice", "bob", "carol"), client=client)
+
+    assert client.fetched == []
+    assert next(profiles)["username"] == "alice"
+    assert client.fetched == _urls("alice")
+    assert [p["username"] for p in profiles] == ["carol"]
+
+def test_iter_profiles_respects_max_profiles_and_cancel():
+    client = FakeClient()
+    profiles = list(iter_profiles(_urls("a", "b", "c"), client=client, max_profiles=2))
+    assert [p["username"] for p in profiles] == ["a", "b"]
+    assert client.fetched == _urls("a", "b")
+
+    cancel = threading.Event()
+    client = FakeClient()
+    profiles = iter_profiles(_urls("a", "b", "c"), client=client, cancel=cancel)
+    next(profiles)
+    cancel.set()
+    assert list(profiles) == []
+    assert client.fetched == _urls("a")
+
+def test_iter_profiles_from_stargazers_source():
+    page = '<a data-hovercard-type="user" href="/alice">Alice</a>'
+    client = FakeClient(stargazer_pages=[page, page])
+    profiles = iter_profiles(StargazersSource("https://github.com/o/r"), client=client, max_profiles=1)
+
+    assert [p["username"] for p in profiles] == ["alice"]
+    # Only the first stargazers page was needed
+    assert client.fetched == ["stargazers:0", "https://github.com/alice"]
+
+def test_iter_profiles_stops_stargazer_discovery_via_limiter():
+    class OnePageLimiter:
+        def __init__(self):
+            self.pages = 0
+
+        def request_allowed(self):
+            self.pages += 1
+            return self.pages <= 1
+
+        def batch_limit(self, size):
+            return size
+
+        def batch_done(self, attempted):
+            pass
+
+    page = '<a data-hovercard-type="user" href="/alice">Alice</a>'
+    client = FakeClient(stargazer_pages=[page, page, page])
+    profiles = list(iter_profiles(StargazersSource("https://github.com/o/r"), client=client, limiter=OnePageLimiter()))
+
+    assert [p["username"] for p in profiles] == ["alice"]
+    assert client.fetched == ["stargazers:0", "https://github.com/alice"]
+
+def test_iter_profiles_rejects_bare_string():
+    with pytest.raises(TypeError):
+        list(iter_profiles("https://github.com/alice", client=FakeClient()))
+
+def test_aiter_profiles_yields_and_stops_on_close():
+    client = FakeClient()
+
+    async def consume():
+        usernames = []
+        profiles = aiter_profiles(_urls("a", "b", "c"), client=client)
+        async for profile in profiles:
+            usernames.append(profile["username"])
+            if len(usernames) == 2:
+                break
+        await profiles.aclose()
+        return usernames
+
+    assert asyncio.run(consume()) == ["a", "b"]
+    assert client.fetched == _urls("a", "b")
+
+class FakeBatchBackend:
+    batch_size = 2
+
+    def __init__(self):
+        self.batches = []
+
+    def fetch_batch(self, urls):
+        self.batches.append(list(urls))
+        return [(url, {"user": url}) for url in urls]
+
+def test_iter_profiles_uses_backend_batches():
+    backend = FakeBatchBackend()
+    profiles = list(iter_profiles(_urls("a", "b", "c", "d", "e"), client=FakeClient(), backend=backend, max_profiles=3))
+
+    assert [p["user"] for p in profiles] == _urls("a", "b", "c")
+    assert backend.batches == [_urls("a", "b"), _urls("c")]